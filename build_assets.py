@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+
+# ------------------------------------------------------------
+# Local Static Assets
+# ------------------------------------------------------------
+# Every image the page shows is served from ./static (Streamlit serves it at
+# app/static/<name> with server.enableStaticServing). This script rebuilds
+# those files from the full-size originals in the repo root and checks the
+# total against a page-weight budget. Pillow is only needed to rebuild, not
+# to run the app or to check the budget.
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT, "static")
+
+# target name -> (source file, longest side in px)
+ASSETS = {
+    "logo.png": ("new logo.png", 223),
+    "calculator.png": ("Calculator (1).png", 400),
+}
+
+# Total bytes of images the browser may download on first load
+PAGE_WEIGHT_BUDGET = 200_000
+
+# Bump when an asset changes so browsers drop their cached copy
+ASSET_VERSION = "1"
+
+
+def build():
+    """Resize and recompress each source image into ./static."""
+    from PIL import Image
+
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    for target, (source, max_side) in ASSETS.items():
+        with Image.open(os.path.join(ROOT, source)) as img:
+            img.thumbnail((max_side, max_side), Image.LANCZOS)
+            # An adaptive 256-colour palette keeps the alpha edge and cuts size several-fold
+            img = img.convert("RGBA").quantize(256, method=Image.Quantize.FASTOCTREE)
+            img.save(os.path.join(STATIC_DIR, target), optimize=True)
+
+
+def page_weight():
+    """Return {asset: bytes} for every file in ./static that the page references."""
+    return {name: os.path.getsize(os.path.join(STATIC_DIR, name)) for name in ASSETS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild ./static images and check the page-weight budget.")
+    parser.add_argument("--check", action="store_true", help="only measure; do not rebuild (no Pillow needed)")
+    args = parser.parse_args(argv)
+
+    if not args.check:
+        build()
+
+    weights = page_weight()
+    for name, size in weights.items():
+        source = os.path.join(ROOT, ASSETS[name][0])
+        print(f"{name:<16} {size / 1000:8.1f} kB   (source {os.path.getsize(source) / 1000:.1f} kB)")
+    total = sum(weights.values())
+    print(f"{'total':<16} {total / 1000:8.1f} kB   (budget {PAGE_WEIGHT_BUDGET / 1000:.1f} kB)")
+
+    if total > PAGE_WEIGHT_BUDGET:
+        print("Page-weight budget exceeded.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import atexit
+import glob
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+import units
+
+try:
+    # Ships with Streamlit; its CSV writer is ~10x faster than DataFrame.to_csv
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+from pitzer_engine import SPECIES, TC, PC, OMEGA, pitzer_fugacity
+
+# ------------------------------------------------------------
+# Bulk Upload (chunked CSV / Excel processing)
+# ------------------------------------------------------------
+# Input columns: gas, T, P and optionally y (defaults to 1). Column names
+# are matched case-insensitively. Rows are handled as DataFrame chunks end
+# to end, never as per-row Python objects.
+REQUIRED_COLUMNS = ("gas", "T", "P")
+CHUNK_ROWS = 100_000
+SPECIES_LOOKUP = pd.Index(SPECIES)
+
+# Result files older than this are deleted, whether or not their session
+# is still open; abandoned sessions never clean up after themselves.
+RESULT_MAX_AGE = 6 * 3600  # seconds
+RESULT_DIR_PREFIX = "fugacitor-bulk-"
+
+
+def _normalise_columns(chunk):
+    """Rename gas/T/P/y columns to their canonical spelling."""
+    canonical = {c.lower(): c for c in REQUIRED_COLUMNS + ("y",)}
+    chunk = chunk.rename(columns=lambda c: canonical.get(str(c).strip().lower(), c))
+    missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    return chunk
+
+
+def _excel_chunks(fileobj, chunksize):
+    """Stream an .xlsx sheet in row chunks via openpyxl's read-only mode."""
+    try:
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+    except ImportError:
+        raise ValueError("Reading Excel files requires openpyxl (pip install openpyxl)")
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError) as exc:
+        raise ValueError(f"Not a readable .xlsx file ({exc})") from exc
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == chunksize:
+                yield pd.DataFrame.from_records(buffer, columns=header)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(fileobj, filename, chunksize=CHUNK_ROWS):
+    """Yield DataFrame chunks of an uploaded CSV or Excel file."""
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        chunks = _excel_chunks(fileobj, chunksize)
+    else:
+        chunks = pd.read_csv(fileobj, chunksize=chunksize)
+    for chunk in chunks:
+        yield _normalise_columns(chunk)
+
+
+def evaluate_chunk(chunk, t_conv, p_conv, f_conv):
+    """Validate names and evaluate φ / fugacity for one chunk in a single pass.
+
+    Unknown gas names, non-numeric or non-positive T / P and a y outside
+    [0, 1] give NaN results and a message in the `error` column instead of
+    failing the whole file. A missing y column means pure gas (y = 1).
+    """
+    idx = SPECIES_LOOKUP.get_indexer(chunk["gas"].astype(str).str.strip())
+    known = idx >= 0
+    safe_idx = np.where(known, idx, 0)
+
+    T = units.to_internal(pd.to_numeric(chunk["T"], errors="coerce").to_numpy(dtype=float), t_conv)
+    P = units.to_internal(pd.to_numeric(chunk["P"], errors="coerce").to_numpy(dtype=float), p_conv)
+    numeric_tp = ~np.isnan(T) & ~np.isnan(P)
+    valid_tp = (T > 0) & (P > 0)
+    if "y" in chunk.columns:
+        y = pd.to_numeric(chunk["y"], errors="coerce").to_numpy(dtype=float)
+        valid_y = (y >= 0) & (y <= 1)
+    else:
+        y = np.ones(len(chunk))
+        valid_y = np.ones(len(chunk), dtype=bool)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        res = pitzer_fugacity(T, P, TC[safe_idx], PC[safe_idx], OMEGA[safe_idx])
+    ok = known & valid_tp & valid_y
+
+    out = chunk.copy()
+    out["Tr"] = np.where(ok, res["Tr"], np.nan)
+    out["Pr"] = np.where(ok, res["Pr"], np.nan)
+    out["phi"] = np.where(ok, res["phi"], np.nan)
+    out["fugacity"] = np.where(ok, units.from_internal(res["phi"] * y * P, f_conv), np.nan)
+    out["error"] = np.select(
+        [~known, ~numeric_tp, ~valid_tp, ~valid_y],
+        ["unknown gas", "T and P must be numeric", "T and P must be positive", "y must be a number from 0 to 1"],
+        ""
+    )
+    return out
+
+
+def write_csv(result, out_fh, header):
+    """Append one result chunk as CSV to a binary file handle."""
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(result, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed numbers and text in one column (typical of Excel input):
+            # write those columns as text, exactly as they appeared
+            mixed = {c: "string" for c in result.columns if result[c].dtype == object}
+            table = pa.Table.from_pandas(result.astype(mixed), preserve_index=False)
+        pa_csv.write_csv(table, out_fh, pa_csv.WriteOptions(include_header=header))
+    else:
+        result.to_csv(out_fh, header=header, index=False, mode="wb", encoding="utf-8")
+
+
+def process_upload(fileobj, filename, out_fh, t_conv, p_conv, f_conv,
+                   chunksize=CHUNK_ROWS, progress=None):
+    """Run a whole upload chunk by chunk, appending CSV results to binary `out_fh`.
+
+    `progress`, if given, is called with the fraction of the input consumed.
+    Returns a summary dict with row and error counts.
+    """
+    start = fileobj.tell()
+    size = fileobj.seek(0, os.SEEK_END) - start
+    fileobj.seek(start)
+    rows = errors = 0
+    for i, chunk in enumerate(iter_chunks(fileobj, filename, chunksize)):
+        result = evaluate_chunk(chunk, t_conv, p_conv, f_conv)
+        write_csv(result, out_fh, header=(i == 0))
+        rows += len(result)
+        errors += int((result["error"] != "").sum())
+        if progress is not None and size:
+            progress(min((fileobj.tell() - start) / size, 1.0))
+    if progress is not None:
+        progress(1.0)
+    return {"rows": rows, "errors": errors}
+
+
+# ------------------------------------------------------------
+# Result Files (per-process temp dir, swept by age)
+# ------------------------------------------------------------
+_result_dir = None
+_result_dir_lock = threading.Lock()
+
+
+def _remove_result_dir():
+    if _result_dir is not None:
+        shutil.rmtree(_result_dir, ignore_errors=True)
+
+
+def result_dir():
+    """This process's result directory, created on first use and removed at exit.
+
+    Creating it also clears directories left behind by processes that died
+    without running their exit handler.
+    """
+    global _result_dir
+    with _result_dir_lock:
+        if _result_dir is None:
+            cutoff = time.time() - RESULT_MAX_AGE
+            for stale in glob.glob(os.path.join(tempfile.gettempdir(), RESULT_DIR_PREFIX + "*")):
+                try:
+                    if os.path.getmtime(stale) < cutoff:
+                        shutil.rmtree(stale, ignore_errors=True)
+                except OSError:
+                    pass
+            _result_dir = tempfile.mkdtemp(prefix=RESULT_DIR_PREFIX)
+            atexit.register(_remove_result_dir)
+        # Another process's sweep may have removed an idle directory
+        os.makedirs(_result_dir, exist_ok=True)
+        return _result_dir
+
+
+def sweep_results(max_age=RESULT_MAX_AGE):
+    """Delete result files in this process's directory older than `max_age` seconds."""
+    cutoff = time.time() - max_age
+    for entry in os.scandir(result_dir()):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def read_result(path):
+    """Bytes of a finished result file, for a deferred download."""
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def new_result_file():
+    """Open a fresh binary result file for one upload, sweeping old ones first."""
+    sweep_results()
+    return tempfile.NamedTemporaryFile(dir=result_dir(), suffix=".csv", delete=False)
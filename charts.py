@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+import result_cache
+from pitzer_engine import pitzer_fugacity
+
+# ------------------------------------------------------------
+# Server-Side Downsampling (Largest-Triangle-Three-Buckets)
+# ------------------------------------------------------------
+MAX_POINTS = 2000
+
+
+def lttb(x, y, n_out=MAX_POINTS):
+    """Return the indices of `n_out` points that keep the visual shape of y(x).
+
+    x must be sorted. The first and last points are always kept; every
+    bucket in between contributes the point forming the largest triangle
+    with the previous pick and the mean of the next bucket.
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo = edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def downsample_curves(x, curves, n_out=MAX_POINTS, x_name="x", value_name="value", series_name="Gas"):
+    """Downsample several curves sharing one x array into a long-form DataFrame.
+
+    `curves` maps a series label to its y array. Each curve is decimated on
+    its own, so the frame holds at most n_out points per series.
+    """
+    frames = []
+    for label, y in curves.items():
+        keep = lttb(x, y, n_out)
+        frames.append(pd.DataFrame({x_name: x[keep], value_name: np.asarray(y)[keep], series_name: label}))
+    return pd.concat(frames, ignore_index=True)
+
+
+# ------------------------------------------------------------
+# φ / Fugacity Sweeps for the Selected Species
+# ------------------------------------------------------------
+def sweep_species(species_inputs, axis, lo, hi, n_eval, T, P):
+    """Evaluate φ and fugacity for every species along a P or T sweep.
+
+    `axis` is "P" (T held fixed) or "T" (P held fixed). Returns the sweep
+    grid and two dicts of curves, {label: φ} and {label: f}, each computed
+    in one broadcast call over all species.
+    """
+    grid = np.linspace(lo, hi, int(n_eval))
+    Tc = np.array([s["Tc"] for s in species_inputs], dtype=float)[:, None]
+    Pc = np.array([s["Pc"] for s in species_inputs], dtype=float)[:, None]
+    omega = np.array([s["omega"] for s in species_inputs], dtype=float)[:, None]
+    y = np.array([s["y"] for s in species_inputs], dtype=float)[:, None]
+
+    def compute():
+        if axis == "P":
+            return {"phi": pitzer_fugacity(T, grid, Tc, Pc, omega)["phi"]}
+        return {"phi": pitzer_fugacity(grid, P, Tc, Pc, omega)["phi"]}
+
+    # φ is fully determined by the grid, the held T or P and the species
+    # constants; mole fractions only scale fugacity, so they stay out of the key
+    phi = result_cache.cached(
+        "sweep_species", compute, store_dtype=np.float32,
+        axis=axis, lo=float(lo), hi=float(hi), n_eval=int(n_eval),
+        held=float(T if axis == "P" else P), Tc=Tc, Pc=Pc, omega=omega
+    )["phi"]
+    fugacity = phi * y * (grid if axis == "P" else P)
+
+    labels = [f"{i+1}. {s['name']}" for i, s in enumerate(species_inputs)]
+    phi_curves = dict(zip(labels, phi))
+    f_curves = dict(zip(labels, fugacity))
+    return grid, phi_curves, f_curves
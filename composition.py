@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+import result_cache
+from charts import MAX_POINTS, downsample_curves
+from pitzer_engine import pitzer_fugacity
+
+# ------------------------------------------------------------
+# Composition Simplex Grids
+# ------------------------------------------------------------
+def simplex_grid(n_components, divisions):
+    """All compositions with mole fractions in steps of 1/divisions.
+
+    Returns (compositions, counts): an (m, n_components) float array whose
+    rows sum to 1, and the matching integer counts (y * divisions).
+    """
+    if n_components == 2:
+        i = np.arange(divisions + 1)
+        counts = np.stack([i, divisions - i], axis=1)
+    elif n_components == 3:
+        i, j = np.meshgrid(np.arange(divisions + 1), np.arange(divisions + 1), indexing="ij")
+        keep = i + j <= divisions
+        i, j = i[keep], j[keep]
+        counts = np.stack([i, j, divisions - i - j], axis=1)
+    else:
+        raise ValueError("Composition sweeps support binary and ternary mixtures only")
+    return counts / divisions, counts
+
+
+# ------------------------------------------------------------
+# Vectorized Sweep
+# ------------------------------------------------------------
+def composition_sweep(species, compositions, T, P):
+    """Fugacity of every component over compositions x (T, P) conditions.
+
+    `species` is a list of dicts with Tc, Pc and omega; T and P are
+    equal-length arrays of condition points. φ depends only on the
+    condition, so it is evaluated once per (condition, species) and reused
+    for every composition. Returns (phi, fugacity) with shapes
+    (n_cond, n_species) and (n_cond, n_comp, n_species).
+    """
+    T = np.atleast_1d(np.asarray(T, dtype=float))[:, None]
+    P = np.atleast_1d(np.asarray(P, dtype=float))[:, None]
+    Tc = np.array([s["Tc"] for s in species], dtype=float)[None, :]
+    Pc = np.array([s["Pc"] for s in species], dtype=float)[None, :]
+    omega = np.array([s["omega"] for s in species], dtype=float)[None, :]
+
+    def compute():
+        phi = pitzer_fugacity(T, P, Tc, Pc, omega)["phi"]
+        return {"phi": phi, "fugacity": phi[:, None, :] * compositions[None, :, :] * P[:, :, None]}
+
+    res = result_cache.cached(
+        "composition_sweep", compute, store_dtype=np.float32,
+        compositions=np.asarray(compositions, dtype=float), T=T, P=P, Tc=Tc, Pc=Pc, omega=omega
+    )
+    return res["phi"], res["fugacity"]
+
+
+# ------------------------------------------------------------
+# Plot Data (downsampled)
+# ------------------------------------------------------------
+def component_labels(names):
+    """Positional labels ("1. Methane", ...), unique even if a species is picked twice."""
+    return [f"{i+1}. {name}" for i, name in enumerate(names)]
+
+
+def binary_curves(names, compositions, fugacity, condition_labels, n_out=MAX_POINTS):
+    """Long-form frame of f_i vs y1 for each component and condition, LTTB-decimated."""
+    labels = component_labels(names)
+    curves = {
+        f"{label} @ {cond}": fugacity[c, :, k]
+        for c, cond in enumerate(condition_labels)
+        for k, label in enumerate(labels)
+    }
+    return downsample_curves(compositions[:, 0], curves, n_out, x_name=f"y ({labels[0]})",
+                             value_name="Fugacity", series_name="Series")
+
+
+def ternary_points(names, compositions, counts, values, max_points=MAX_POINTS):
+    """Triangle-plot coordinates for one value per composition, thinned to max_points.
+
+    Thinning keeps a regular sub-lattice of the simplex grid (every step-th
+    division), so the plot stays evenly covered. `step` always divides the
+    number of divisions, so all three corners and edges are kept. Mole
+    fraction columns use component_labels(names).
+    """
+    divisions = int(counts[0].sum())
+    step = 1
+    while ((divisions % step) or
+           (divisions // step + 1) * (divisions // step + 2) // 2 > max_points):
+        step += 1
+    keep = np.all(counts[:, :2] % step == 0, axis=1)
+
+    y = compositions[keep]
+    labels = component_labels(names)
+    # Barycentric -> Cartesian on an equilateral triangle with unit side
+    return pd.DataFrame({
+        "x": y[:, 1] + 0.5 * y[:, 2],
+        "h": np.sqrt(3) / 2 * y[:, 2],
+        labels[0]: y[:, 0],
+        labels[1]: y[:, 1],
+        labels[2]: y[:, 2],
+        "value": np.asarray(values)[keep],
+    })
@@ -0,0 +1,160 @@
+import numpy as np
+
+from pitzer_engine import SPECIES_INDEX, TC, PC, OMEGA, pitzer_fugacity
+
+# ------------------------------------------------------------
+# Gas-Phase Reaction Equilibrium
+# ------------------------------------------------------------
+# For each reaction r:  K_r = Kφ_r · Ky_r · (P / P°)^Δν_r
+# with Kφ_r = Π φ_i^ν_ri and Ky_r = Π y_i^ν_ri. Species are built-in names
+# from `gases`; stoichiometric coefficients are negative for reactants.
+P_STANDARD = 1.0   # bar
+TOLERANCE = 1e-10  # max |residual| in ln K units
+MAX_ITER = 100
+
+# Newton steps stop this fraction short of driving any amount to zero
+STEP_TO_BOUNDARY = 0.99
+
+
+def stoichiometry(reactions, extra_species=()):
+    """Species list and ν matrix for reactions given as {name: coefficient} dicts.
+
+    Species appear in order of first mention, followed by any
+    `extra_species` (e.g. inerts in the feed). Returns (names, nu) with
+    nu of shape (n_reactions, n_species).
+    """
+    names = []
+    for name in [n for rxn in reactions for n in rxn] + list(extra_species):
+        if name not in SPECIES_INDEX:
+            raise ValueError(f"Unknown species: {name}")
+        if name not in names:
+            names.append(name)
+
+    nu = np.zeros((len(reactions), len(names)))
+    for r, rxn in enumerate(reactions):
+        for name, coeff in rxn.items():
+            nu[r, names.index(name)] = coeff
+    if np.linalg.matrix_rank(nu) < len(reactions):
+        raise ValueError("Reactions must be linearly independent")
+    return names, nu
+
+
+def _initial_extents(n0, nu):
+    """A start point where every participating species is present.
+
+    In each pass, every reaction is advanced by half its largest feasible
+    extent from the current amounts, divided by the number of reactions:
+    forward if a product is missing, backward if a reactant is missing. No
+    species loses more than half of what it has, and repeating the pass
+    once per reaction lets products of one reaction feed the next.
+    """
+    extent = np.zeros(n0.shape[:1] + nu.shape[:1])
+    for _ in range(nu.shape[0]):
+        n = (n0 + extent @ nu)[:, None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Largest extent each reaction can take alone, forward and backward
+            fwd = np.where(nu < 0, n / -nu, np.inf).min(axis=2)
+            rev = np.where(nu > 0, n / nu, np.inf).min(axis=2)
+        fwd = np.where(np.isfinite(fwd), fwd, 0.0)
+        rev = np.where(np.isfinite(rev), rev, 0.0)
+        extent += (fwd - rev) / (2 * nu.shape[0])
+    return extent
+
+
+def solve_equilibrium(reactions, K, feed, T, P, p_standard=P_STANDARD,
+                      tol=TOLERANCE, max_iter=MAX_ITER):
+    """Solve for equilibrium extents over many (T, P, feed) cases at once.
+
+    `reactions` is a list of {species: ν} dicts and `K` the standard-state
+    equilibrium constants, broadcastable to (n_cases, n_reactions); for a
+    single reaction a 1-D K gives one value per case. `feed` maps species
+    names (reactants, products or inerts) to feed moles; feed values,
+    T [K] and P [bar] broadcast to n_cases.
+
+    The Pitzer φ of a species depends only on (T, P), so Kφ is evaluated
+    once per case and the damped Newton iteration runs on
+    Σ ν ln y_i = ln K - ln Kφ - Δν ln(P/P°) for all cases together.
+
+    Returns a dict of arrays with the species order under "species";
+    cases that do not converge are flagged and left as NaN.
+    """
+    names, nu = stoichiometry(reactions, extra_species=feed)
+    n_rxn = nu.shape[0]
+
+    columns = [np.asarray(feed.get(name, 0.0), dtype=float) for name in names]
+    T, P, *columns = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float), *columns)
+    T, P = np.atleast_1d(T).astype(float), np.atleast_1d(P).astype(float)
+    n0 = np.stack([np.atleast_1d(c) for c in columns], axis=-1)
+    n_cases = len(T)
+    K = np.asarray(K, dtype=float)
+    if K.ndim == 1 and n_rxn == 1:
+        # One reaction: a 1-D K is one value per case
+        K = K[:, None]
+    ln_K = np.log(np.broadcast_to(K, (n_cases, n_rxn)))
+
+    idx = np.array([SPECIES_INDEX[name] for name in names], dtype=np.intp)
+    phi = pitzer_fugacity(T[:, None], P[:, None], TC[idx], PC[idx], OMEGA[idx])["phi"]
+    ln_K_phi = np.log(phi) @ nu.T
+    delta_nu = nu.sum(axis=1)
+    target = ln_K - ln_K_phi - delta_nu * np.log(P / p_standard)[:, None]
+
+    # Species with ν = 0 everywhere (inerts) never enter a logarithm
+    reacting = np.any(nu != 0, axis=0)
+    extent = _initial_extents(n0, nu)
+    moles = n0 + extent @ nu
+    active = np.all((moles > 0) | ~reacting, axis=1) & (n0.sum(axis=1) > 0)
+    converged = np.zeros(n_cases, dtype=bool)
+    iterations = np.zeros(n_cases, dtype=int)
+
+    # One more residual pass than steps, so a case that converges on the last step counts
+    for it in range(max_iter + 1):
+        if not active.any():
+            break
+        n, xi, tgt = moles[active], extent[active], target[active]
+        total = n.sum(axis=1, keepdims=True)
+        ln_y = np.log(np.where(reacting, n, 1.0) / total)
+        residual = ln_y @ nu.T - tgt
+
+        done = np.abs(residual).max(axis=1) < tol
+        converged[np.flatnonzero(active)[done]] = True
+        iterations[np.flatnonzero(active)[done]] = it
+        active[np.flatnonzero(active)[done]] = False
+        if done.all() or it == max_iter:
+            break
+        n, xi, total, residual = n[~done], xi[~done], total[~done], residual[~done]
+
+        # d(Σ ν_r ln y)/dξ_s = Σ_i ν_ri ν_si / n_i - Δν_r Δν_s / N
+        inv_n = np.divide(1.0, n, out=np.zeros_like(n), where=reacting)
+        jac = (np.einsum("ri,ci,si->crs", nu, inv_n, nu)
+               - delta_nu[None, :, None] * delta_nu[None, None, :] / total[:, :, None])
+        step = -np.linalg.solve(jac, residual[:, :, None])[:, :, 0]
+
+        # Damp the step so every amount stays positive
+        dn = step @ nu
+        with np.errstate(divide="ignore", invalid="ignore"):
+            limit = np.where(dn < 0, -STEP_TO_BOUNDARY * n / dn, np.inf).min(axis=1)
+        alpha = np.minimum(1.0, limit)[:, None]
+
+        rows = np.flatnonzero(active)
+        extent[rows] = xi + alpha * step
+        # Updating amounts directly keeps trace species accurate to full relative precision
+        moles[rows] = n + alpha * dn
+
+    failed = ~converged
+    extent[failed] = np.nan
+    moles[failed] = np.nan
+    y = moles / moles.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ln_K_y = np.where(reacting, np.log(y), 0.0) @ nu.T
+
+    return {
+        "species": names,
+        "extent": extent,
+        "moles": moles,
+        "y": y,
+        "phi": phi,
+        "K_phi": np.exp(ln_K_phi),
+        "K_y": np.exp(ln_K_y),
+        "converged": converged,
+        "iterations": np.where(converged, iterations, max_iter),
+    }
@@ -0,0 +1,324 @@
+import argparse
+import contextlib
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import units
+from pitzer_engine import SPECIES_INDEX, TC, PC, OMEGA, ln_phi_slope
+
+# ------------------------------------------------------------
+# Streaming Plant-Historian Mode
+# ------------------------------------------------------------
+# Records are dicts like
+#     {"ts": "2026-10-19T08:00:00", "line": "L1", "T": 350.0, "P": 12.5,
+#      "y": {"Methane": 0.9, "Ethane": 0.1}}
+# with T in K and P in bar unless other column units are given (see units.py).
+# Sources may also yield None as an idle tick so that a partly filled batch
+# can still be flushed on time. A bad record never stops the stream: it comes
+# back with NaN results and a message in its "error" field.
+
+
+# ------------------------------------------------------------
+# Record Sources
+# ------------------------------------------------------------
+def parse_record(line):
+    """Decode one JSON line; anything but a JSON object becomes an error record."""
+    try:
+        rec = json.loads(line)
+    except ValueError:
+        return {"error": "unparseable JSON line", "raw": line[:200]}
+    if not isinstance(rec, dict):
+        return {"error": "record is not a JSON object", "raw": line[:200]}
+    return rec
+
+
+def read_jsonl(fh, idle_interval=None):
+    """Yield records from an open JSON lines file or pipe.
+
+    With `idle_interval` set, lines are read on a background thread and None
+    is yielded whenever nothing arrives for that many seconds, so a quiet
+    pipe still lets downstream batching flush on time.
+    """
+    if idle_interval is None:
+        lines = fh
+    else:
+        lines = _lines_with_ticks(fh, idle_interval)
+    for line in lines:
+        if line is None:
+            yield None
+            continue
+        line = line.strip()
+        if line:
+            yield parse_record(line)
+
+
+_EOF = object()
+
+
+def _lines_with_ticks(fh, idle_interval):
+    """Lines of `fh` read by a daemon thread, with None for every idle interval."""
+    lines = queue.Queue(maxsize=65536)
+
+    def reader():
+        try:
+            for line in fh:
+                lines.put(line)
+        finally:
+            lines.put(_EOF)
+
+    threading.Thread(target=reader, name="historian-reader", daemon=True).start()
+    while True:
+        try:
+            line = lines.get(timeout=idle_interval)
+        except queue.Empty:
+            yield None
+            continue
+        if line is _EOF:
+            return
+        yield line
+
+
+def tail_jsonl(path, poll_interval=0.25, from_start=False):
+    """Follow a growing JSON lines file like `tail -f`.
+
+    Yields None whenever no complete line is available, so downstream
+    batching can honour its latency bound while the feed is quiet.
+    """
+    with open(path) as fh:
+        if not from_start:
+            fh.seek(0, os.SEEK_END)
+        pending = ""
+        while True:
+            chunk = fh.readline()
+            if not chunk:
+                yield None
+                time.sleep(poll_interval)
+                continue
+            pending += chunk
+            if not pending.endswith("\n"):
+                continue
+            line, pending = pending.strip(), ""
+            if line:
+                yield parse_record(line)
+
+
+# ------------------------------------------------------------
+# Micro-Batching
+# ------------------------------------------------------------
+def micro_batches(records, max_size=4096, max_latency=0.5):
+    """Group records into lists of at most `max_size`.
+
+    A batch is also emitted once its oldest record has waited `max_latency`
+    seconds, so a slow feed never stalls behind a half-empty batch.
+    """
+    batch = []
+    opened = 0.0
+    for rec in records:
+        if rec is not None:
+            if not batch:
+                opened = time.monotonic()
+            batch.append(rec)
+        if batch and (len(batch) >= max_size or time.monotonic() - opened >= max_latency):
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ------------------------------------------------------------
+# Per-Temperature Coefficient Cache
+# ------------------------------------------------------------
+class SlopeCache:
+    """Bounded LRU of ln φ slopes for every built-in species, keyed by T.
+
+    Temperatures are rounded to `t_resolution` K before lookup (0 disables
+    rounding), so a steady line with sensor jitter keeps hitting the cache.
+    """
+
+    def __init__(self, max_entries=256, t_resolution=0.01):
+        self.max_entries = max_entries
+        self.t_resolution = t_resolution
+        self._slopes = OrderedDict()
+
+    def quantize(self, T):
+        T = np.asarray(T, dtype=float)
+        if self.t_resolution:
+            return np.round(T / self.t_resolution) * self.t_resolution
+        return T
+
+    def matrix(self, temps):
+        """Return an (len(temps), n_species) slope matrix for unique temps."""
+        rows = []
+        for T in temps.tolist():
+            row = self._slopes.get(T)
+            if row is None:
+                row = ln_phi_slope(T, TC, PC, OMEGA)
+                self._slopes[T] = row
+                if len(self._slopes) > self.max_entries:
+                    self._slopes.popitem(last=False)
+            else:
+                self._slopes.move_to_end(T)
+            rows.append(row)
+        return np.stack(rows)
+
+
+# ------------------------------------------------------------
+# Batch Evaluation
+# ------------------------------------------------------------
+def evaluate_batch(batch, cache, t_conv=None, p_conv=None, f_conv=None):
+    """Evaluate φ and fugacity for every (record, species) pair in one pass.
+
+    `t_conv`, `p_conv` and `f_conv` are (scale, offset) pairs from
+    units.resolve() for the T and P input columns and the fugacity output;
+    None means K / bar. Species not in the built-in table come back as NaN
+    rather than stopping the stream, and so does every species of a record
+    with a missing or non-numeric T, P or y; such records also carry a
+    message in "error".
+    """
+    T = np.array([_number(rec.get("T")) for rec in batch])
+    P = np.array([_number(rec.get("P")) for rec in batch])
+    if t_conv:
+        T = units.to_internal(T, t_conv)
+    if p_conv:
+        P = units.to_internal(P, p_conv)
+    errors = [rec.get("error") for rec in batch]
+    for i, ok in enumerate(np.isfinite(T) & np.isfinite(P) & (T > 0)):
+        if not ok and errors[i] is None:
+            errors[i] = "missing, non-numeric or non-positive T / P"
+
+    names, rec_idx, sp_idx, y = [], [], [], []
+    for i, rec in enumerate(batch):
+        fractions = rec.get("y")
+        if not isinstance(fractions, dict):
+            if errors[i] is None:
+                errors[i] = "missing y (expected {species: mole fraction})"
+            fractions = {}
+        for name, frac in fractions.items():
+            frac = _number(frac)
+            if np.isnan(frac) and errors[i] is None:
+                errors[i] = "non-numeric mole fraction in y"
+            names.append(name)
+            rec_idx.append(i)
+            sp_idx.append(SPECIES_INDEX.get(name, -1))
+            y.append(frac)
+    rec_idx = np.array(rec_idx, dtype=np.intp)
+    sp_idx = np.array(sp_idx, dtype=np.intp)
+    y = np.array(y, dtype=float)
+
+    # Slopes only for usable temperatures; bad records get NaN throughout
+    bad = np.array([e is not None for e in errors], dtype=bool)
+    T = cache.quantize(np.where(bad, np.nan, T))
+    temps, t_idx = np.unique(T[~bad], return_inverse=True)
+    rec_t = np.zeros(len(batch), dtype=np.intp)
+    rec_t[~bad] = t_idx.ravel()
+    slopes = np.full(len(rec_idx), np.nan)
+    usable = (sp_idx >= 0) & ~bad[rec_idx]
+    if usable.any():
+        slopes[usable] = cache.matrix(temps)[rec_t[rec_idx[usable]], sp_idx[usable]]
+
+    P_rows = P[rec_idx]
+    phi = np.exp(P_rows * slopes)
+    fugacity = phi * y * P_rows
+    if f_conv:
+        fugacity = units.from_internal(fugacity, f_conv)
+
+    out = []
+    start = 0
+    for i, rec in enumerate(batch):
+        fractions = rec.get("y")
+        stop = start + (len(fractions) if isinstance(fractions, dict) else 0)
+        out.append({
+            "ts": rec.get("ts"),
+            "line": rec.get("line"),
+            "T": rec.get("T"),
+            "P": rec.get("P"),
+            "phi": dict(zip(names[start:stop], phi[start:stop].tolist())),
+            "fugacity": dict(zip(names[start:stop], fugacity[start:stop].tolist())),
+            "error": errors[i]
+        })
+        start = stop
+    return out
+
+
+def _number(value):
+    """Float value of a JSON scalar, or NaN for null, text, booleans and the like."""
+    if isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def stream_batches(records, max_size=4096, max_latency=0.5, cache=None,
+                   t_unit="K", p_unit="bar", f_unit="bar"):
+    """Generator of result lists, one per micro-batch of an unbounded stream.
+
+    Memory stays constant: at most one batch and a bounded slope cache are
+    held at any time. Units are resolved once here, not per record.
+    """
+    cache = cache or SlopeCache()
+    t_conv = units.resolve(t_unit, "temperature")
+    p_conv = units.resolve(p_unit, "pressure")
+    f_conv = units.resolve(f_unit, "fugacity")
+    for batch in micro_batches(records, max_size, max_latency):
+        yield evaluate_batch(batch, cache, t_conv, p_conv, f_conv)
+
+
+def stream_fugacity(records, max_size=4096, max_latency=0.5, cache=None,
+                    t_unit="K", p_unit="bar", f_unit="bar"):
+    """Generator of per-record results for an unbounded record stream."""
+    for results in stream_batches(records, max_size, max_latency, cache, t_unit, p_unit, f_unit):
+        yield from results
+
+
+# ------------------------------------------------------------
+# Command Line
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream Pitzer fugacities for historian records (JSON lines).")
+    parser.add_argument("source", nargs="?", default="-", help="JSON lines file, or - for stdin")
+    parser.add_argument("--follow", action="store_true", help="keep reading as the file grows")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--max-latency", type=float, default=0.5, help="seconds")
+    parser.add_argument("--t-resolution", type=float, default=0.01, help="K; 0 disables T rounding")
+    parser.add_argument("--t-unit", default="K", help="unit of the T column, e.g. K, °C, F")
+    parser.add_argument("--p-unit", default="bar", help="unit of the P column, e.g. bar, kPa, psig, atm")
+    parser.add_argument("--f-unit", default="bar", help="unit for the fugacity output (absolute units only)")
+    args = parser.parse_args(argv)
+
+    # Fail on a bad unit before reading any input
+    try:
+        units.resolve(args.t_unit, "temperature")
+        units.resolve(args.p_unit, "pressure")
+        units.resolve(args.f_unit, "fugacity")
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    # Tick often enough that a partial batch is flushed close to its deadline
+    idle_interval = max(args.max_latency / 4, 0.01)
+    with contextlib.ExitStack() as stack:
+        if args.source == "-":
+            records = read_jsonl(sys.stdin, idle_interval)
+        elif args.follow:
+            records = tail_jsonl(args.source, poll_interval=idle_interval)
+        else:
+            records = read_jsonl(stack.enter_context(open(args.source)))
+
+        cache = SlopeCache(t_resolution=args.t_resolution)
+        for results in stream_batches(records, args.batch_size, args.max_latency, cache,
+                                      args.t_unit, args.p_unit, args.f_unit):
+            for result in results:
+                sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
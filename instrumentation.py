@@ -0,0 +1,221 @@
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+# ------------------------------------------------------------
+# Configuration (opt-in)
+# ------------------------------------------------------------
+# Instrumentation is off unless FUGACITOR_METRICS_DIR points at a writable
+# directory. When it is off, every hook below returns immediately.
+METRICS_DIR = os.environ.get("FUGACITOR_METRICS_DIR", "")
+ENABLED = bool(METRICS_DIR)
+
+PROM_FILE = "fugacitor_metrics.prom"
+JSONL_FILE = "fugacitor_metrics.jsonl"
+SESSIONS_FILE = "fugacitor_sessions.jsonl"
+
+# ------------------------------------------------------------
+# Global Counters (shared by every session / thread)
+# ------------------------------------------------------------
+_lock = threading.Lock()
+_spans = {}      # name -> {"count", "total", "max"}
+_counters = {}   # name -> int
+_events = []     # buffered span events, flushed by export()
+
+
+def new_session():
+    """Per-session counters: a short random id plus {span: {"count", "total"}}."""
+    return {"id": uuid.uuid4().hex[:12], "spans": {}}
+
+
+def _record(name, elapsed, session):
+    event = {"ts": time.time(), "span": name, "seconds": elapsed}
+    if session is not None:
+        event["session"] = session["id"]
+    with _lock:
+        stat = _spans.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        stat["count"] += 1
+        stat["total"] += elapsed
+        stat["max"] = max(stat["max"], elapsed)
+        _events.append(event)
+
+    if session is not None:
+        stat = session["spans"].setdefault(name, {"count": 0, "total": 0.0})
+        stat["count"] += 1
+        stat["total"] += elapsed
+
+
+# ------------------------------------------------------------
+# Timing Spans
+# ------------------------------------------------------------
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+@contextmanager
+def _timed(name, session):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start, session)
+
+
+def span(name, session=None):
+    """Time a block of code; `session` is an optional dict from new_session()."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _timed(name, session)
+
+
+def begin():
+    """Start a span for top-level code that can't be indented under `with`."""
+    return time.perf_counter() if ENABLED else None
+
+
+def end(name, start, session=None):
+    """Close a span opened with begin()."""
+    if start is not None:
+        _record(name, time.perf_counter() - start, session)
+
+
+def count(name, n=1):
+    """Increment a global counter."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+# ------------------------------------------------------------
+# Exporters
+# ------------------------------------------------------------
+def prometheus_text():
+    """Render the global counters in Prometheus text exposition format."""
+    with _lock:
+        spans = {k: dict(v) for k, v in _spans.items()}
+        counters = dict(_counters)
+
+    lines = [
+        "# HELP fugacitor_span_seconds_total Time spent in each instrumented phase.",
+        "# TYPE fugacitor_span_seconds_total counter",
+    ]
+    lines += [f'fugacitor_span_seconds_total{{span="{k}"}} {v["total"]:.6f}' for k, v in sorted(spans.items())]
+    lines += [
+        "# HELP fugacitor_span_calls_total Number of times each phase ran.",
+        "# TYPE fugacitor_span_calls_total counter",
+    ]
+    lines += [f'fugacitor_span_calls_total{{span="{k}"}} {v["count"]}' for k, v in sorted(spans.items())]
+    lines += [
+        "# HELP fugacitor_span_seconds_max Slowest single run of each phase.",
+        "# TYPE fugacitor_span_seconds_max gauge",
+    ]
+    lines += [f'fugacitor_span_seconds_max{{span="{k}"}} {v["max"]:.6f}' for k, v in sorted(spans.items())]
+    lines += ["# TYPE fugacitor_events_total counter"]
+    lines += [f'fugacitor_events_total{{name="{k}"}} {v}' for k, v in sorted(counters.items())]
+    return "\n".join(lines) + "\n"
+
+
+def export(directory=None, session=None):
+    """Write the Prometheus text file and flush buffered span events as JSON lines.
+
+    Span events carry their session id. If `session` is given, its running
+    totals are also appended to the sessions file, one line per export.
+    """
+    if not ENABLED:
+        return
+    directory = directory or METRICS_DIR
+    os.makedirs(directory, exist_ok=True)
+
+    # Write-then-rename so a textfile collector never reads a partial file
+    prom_path = os.path.join(directory, PROM_FILE)
+    tmp_path = f"{prom_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as fh:
+        fh.write(prometheus_text())
+    os.replace(tmp_path, prom_path)
+
+    with _lock:
+        events, _events[:] = list(_events), []
+    if events:
+        with open(os.path.join(directory, JSONL_FILE), "a") as fh:
+            fh.writelines(json.dumps(e) + "\n" for e in events)
+
+    if session is not None:
+        record = {"ts": time.time(), "session": session["id"], "spans": session["spans"]}
+        with open(os.path.join(directory, SESSIONS_FILE), "a") as fh:
+            fh.write(json.dumps(record) + "\n")
+
+
+# ------------------------------------------------------------
+# On-Demand Profiling Snapshots
+# ------------------------------------------------------------
+# tracemalloc is process-wide: it is started for the first profiled run,
+# stopped after the last one, and left alone if something else started it.
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def start_profile(kind, directory=None):
+    """Start a cProfile ("cprofile") or tracemalloc ("tracemalloc") snapshot.
+
+    Returns a handle for stop_profile(), or None when instrumentation is off
+    or `kind` is not recognised.
+    """
+    if not ENABLED or kind not in ("cprofile", "tracemalloc"):
+        return None
+
+    directory = directory or METRICS_DIR
+    stamp = f"{int(time.time() * 1000)}-{os.getpid()}-{threading.get_ident()}"
+
+    if kind == "cprofile":
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process
+            return None
+        return {"kind": kind, "profiler": profiler,
+                "path": os.path.join(directory, f"profile-{stamp}.pstats")}
+
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+    return {"kind": kind, "path": os.path.join(directory, f"tracemalloc-{stamp}.snapshot")}
+
+
+def stop_profile(handle):
+    """Stop a snapshot started with start_profile() and write it to disk."""
+    if handle is None:
+        return
+    os.makedirs(os.path.dirname(handle["path"]), exist_ok=True)
+
+    if handle["kind"] == "cprofile":
+        handle["profiler"].disable()
+        handle["profiler"].dump_stats(handle["path"])
+    else:
+        global _tracemalloc_users, _tracemalloc_owned
+        with _tracemalloc_lock:
+            try:
+                snapshot = tracemalloc.take_snapshot()
+            finally:
+                _tracemalloc_users -= 1
+                if _tracemalloc_users == 0 and _tracemalloc_owned:
+                    tracemalloc.stop()
+                    _tracemalloc_owned = False
+        snapshot.dump(handle["path"])
@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+# ------------------------------------------------------------
+# Multi-Session Load Test
+# ------------------------------------------------------------
+# Starts one `streamlit run` server and drives N simulated sessions through
+# homepage -> Enter Calculator -> Calculate at the same time, each over its
+# own websocket, speaking the same protobuf messages as the browser. All
+# sessions therefore share one process: cached resources, locks and the GIL
+# are contended exactly as in production. A throwaway session first warms
+# the server (imports, st.cache_resource); per-session memory is the
+# server's RSS growth with all N sessions connected, divided by N.
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pitzer_fugacity_app.py")
+STEPS = ("homepage", "enter_calculator", "calculate")
+
+ENTER_LABEL = "🚀 Enter Calculator"
+CALCULATE_LABEL = "🧮 Calculate Fugacity and φ"
+STARTUP_TIMEOUT = 60.0  # seconds
+STEP_TIMEOUT = 300.0    # seconds
+
+
+# ------------------------------------------------------------
+# Server Process
+# ------------------------------------------------------------
+def start_server(app_path, port):
+    """Launch a headless Streamlit server and wait until it reports healthy."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app_path,
+         "--server.headless", "true", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Streamlit server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.25)
+    stop_server(server)
+    raise RuntimeError("Streamlit server did not become healthy in time")
+
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def process_rss(pid):
+    """Resident set size of process `pid` in bytes (Linux /proc; 0 elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+# ------------------------------------------------------------
+# Simulated Browser Session
+# ------------------------------------------------------------
+async def rerun(ws, click=None):
+    """Request a script run (optionally clicking a button) and wait for it to finish.
+
+    Returns (seconds, {button label: widget id}, [exception messages]).
+    """
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    if click is not None:
+        widget = msg.rerun_script.widget_states.widgets.add()
+        widget.id = click
+        widget.trigger_value = True
+
+    t0 = time.perf_counter()
+    await ws.send(msg.SerializeToString())
+    buttons, errors = {}, []
+    while True:
+        reply = ForwardMsg()
+        reply.ParseFromString(await asyncio.wait_for(ws.recv(), STEP_TIMEOUT))
+        kind = reply.WhichOneof("type")
+        if kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+            element = reply.delta.new_element
+            if element.WhichOneof("type") == "button":
+                buttons[element.button.label] = element.button.id
+            elif element.WhichOneof("type") == "exception":
+                errors.append(element.exception.message)
+        elif kind == "script_finished":
+            return time.perf_counter() - t0, buttons, errors
+
+
+async def walk_session(ws, rounds, timings):
+    """Homepage -> Enter Calculator -> Calculate x rounds, timing each step."""
+    errors = []
+    seconds, buttons, errs = await rerun(ws)
+    timings.append(("homepage", seconds))
+    errors += errs
+
+    # The click flips show_homepage; the calculator renders on the next rerun
+    seconds, _, errs = await rerun(ws, click=buttons[ENTER_LABEL])
+    more, buttons, errs2 = await rerun(ws)
+    timings.append(("enter_calculator", seconds + more))
+    errors += errs + errs2
+
+    for _ in range(rounds):
+        seconds, _, errs = await rerun(ws, click=buttons[CALCULATE_LABEL])
+        timings.append(("calculate", seconds))
+        errors += errs
+    return errors
+
+
+async def run_session(url, rounds, walked=None, release=None):
+    """One simulated user.
+
+    Sets `walked` once its steps are done (or failed), then stays connected
+    until `release` is set so its memory is still held when RSS is sampled.
+    """
+    walked = walked or asyncio.Event()
+    timings, error = [], None
+    try:
+        async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            try:
+                errors = await walk_session(ws, rounds, timings)
+                error = errors[0] if errors else None
+            finally:
+                walked.set()
+            if release is not None:
+                await release.wait()
+    except Exception as exc:
+        error = repr(exc)
+    finally:
+        walked.set()
+    return {"timings": timings, "error": error}
+
+
+async def _drive(url, n_sessions, rounds, server_pid):
+    # Warm-up: imports and shared resources load before anything is measured
+    warm_up = await run_session(url, 1)
+    if warm_up["error"]:
+        raise RuntimeError(f"Warm-up session failed: {warm_up['error']}")
+    await asyncio.sleep(1.0)
+    rss_before = process_rss(server_pid)
+
+    walked = [asyncio.Event() for _ in range(n_sessions)]
+    release = asyncio.Event()
+    wall = time.perf_counter()
+    tasks = [asyncio.create_task(run_session(url, rounds, w, release)) for w in walked]
+    await asyncio.gather(*(w.wait() for w in walked))
+    wall = time.perf_counter() - wall
+
+    # Every session is still connected here
+    rss_loaded = process_rss(server_pid)
+    release.set()
+    results = await asyncio.gather(*tasks)
+    return results, wall, rss_before, rss_loaded
+
+
+def run_load_test(n_sessions, rounds=1, app_path=APP_PATH, port=8599):
+    """Run the sessions concurrently against one server; return latency and memory figures."""
+    server = start_server(app_path, port)
+    try:
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        results, wall, rss_before, rss_loaded = asyncio.run(_drive(url, n_sessions, rounds, server.pid))
+        server_rss = process_rss(server.pid)
+    finally:
+        stop_server(server)
+
+    latencies = {}
+    for step in STEPS:
+        values = np.array([sec for r in results for name, sec in r["timings"] if name == step])
+        if len(values):
+            latencies[step] = {
+                "count": len(values),
+                "p50": float(np.percentile(values, 50)),
+                "p90": float(np.percentile(values, 90)),
+                "p99": float(np.percentile(values, 99)),
+                "max": float(values.max()),
+            }
+
+    return {
+        "sessions": n_sessions,
+        "wall_seconds": wall,
+        "latency": latencies,
+        "memory_per_session_mb": (rss_loaded - rss_before) / n_sessions / 1e6,
+        "server_rss_mb": server_rss / 1e6,
+        "errors": [r["error"] for r in results if r["error"]],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent sessions against one fugacity app server.")
+    parser.add_argument("-n", "--sessions", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=1, help="calculations per session")
+    parser.add_argument("--app", default=APP_PATH)
+    parser.add_argument("--port", type=int, default=8599, help="port for the test server")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args.sessions, args.rounds, args.app, args.port)
+
+    print(f"{report['sessions']} concurrent sessions on one server in {report['wall_seconds']:.2f} s")
+    print(f"{'step':<18}{'n':>5}{'p50 s':>9}{'p90 s':>9}{'p99 s':>9}{'max s':>9}")
+    for step, stat in report["latency"].items():
+        print(f"{step:<18}{stat['count']:>5}{stat['p50']:>9.3f}{stat['p90']:>9.3f}{stat['p99']:>9.3f}{stat['max']:>9.3f}")
+    print(f"memory per connected session: {report['memory_per_session_mb']:.2f} MB (server RSS growth / sessions)")
+    print(f"server RSS at end: {report['server_rss_mb']:.0f} MB")
+    if report["errors"]:
+        print(f"{len(report['errors'])} session(s) failed; first error: {report['errors'][0]}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
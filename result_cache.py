@@ -0,0 +1,233 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+
+import numpy as np
+
+from pitzer_engine import ENGINE_VERSION, PROPERTY_DATA_VERSION
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, eviction just isn't serialised
+    fcntl = None
+
+# ------------------------------------------------------------
+# Configuration (opt-in)
+# ------------------------------------------------------------
+# The cache is off unless FUGACITOR_CACHE_DIR points at a writable directory,
+# ideally on a volume that survives restarts and redeploys. Several app
+# workers and batch jobs may share the same directory.
+CACHE_DIR = os.environ.get("FUGACITOR_CACHE_DIR", "")
+MAX_BYTES = int(float(os.environ.get("FUGACITOR_CACHE_MAX_MB", "1024")) * 1e6)
+# Results that compute faster than this are not worth a disk round trip
+MIN_COMPUTE_SECONDS = float(os.environ.get("FUGACITOR_CACHE_MIN_MS", "50")) / 1e3
+
+LOCK_FILE = ".lock"
+SUFFIX = ".npz"
+
+
+# ------------------------------------------------------------
+# Content Fingerprints
+# ------------------------------------------------------------
+def fingerprint(kind, **inputs):
+    """Hex key for one computation: its kind, its inputs and the engine/data versions.
+
+    Arrays are hashed by dtype, shape and raw bytes; everything else must be
+    JSON-serialisable. Keyword order does not matter.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([kind, ENGINE_VERSION, PROPERTY_DATA_VERSION]).encode())
+    for name in sorted(inputs):
+        value = inputs[name]
+        h.update(name.encode() + b"\0")
+        if isinstance(value, np.ndarray):
+            value = np.ascontiguousarray(value)
+            h.update(f"{value.dtype.str}{value.shape}".encode())
+            h.update(value.tobytes())
+        else:
+            h.update(json.dumps(value, sort_keys=True, default=float).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# ------------------------------------------------------------
+# On-Disk Store
+# ------------------------------------------------------------
+class ResultCache:
+    """Content-addressed store of named float arrays, one compressed .npz file per key.
+
+    Entries are written to a temporary file and renamed into place, so a
+    reader in any process sees either a complete entry or none. Reads mark
+    an entry as recently used (mtime); once the directory grows past
+    `max_bytes`, the least recently used entries are deleted under an
+    exclusive lock file.
+    """
+
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        # Two-character fan-out keeps directory listings short
+        return os.path.join(self.directory, key[:2], key + SUFFIX)
+
+    def get(self, key):
+        """Return the cached {name: array} for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            # Torn or corrupt entry: drop it so the next put rewrites it
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # Read-only or foreign-owned entry: still a hit, just not marked as used
+            pass
+        return arrays
+
+    def put(self, key, arrays):
+        """Store {name: array} under `key`, then evict if over the size bound."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                np.savez_compressed(fh, **{name: np.asarray(a) for name, a in arrays.items()})
+                # Make the data durable before the rename publishes it
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def entries(self):
+        """List (mtime, size, path) for every entry currently on disk."""
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, st.st_size, path))
+        return found
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used entries until the total fits `max_bytes`."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        with open(os.path.join(self.directory, LOCK_FILE), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                found = sorted(self.entries())
+                total = sum(size for _, size, _ in found)
+                for _, size, path in found:
+                    if total <= max_bytes:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                    total -= size
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        return total
+
+    def clear(self):
+        """Delete every entry."""
+        return self.evict(max_bytes=0)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def default_cache():
+    """The process-wide cache from FUGACITOR_CACHE_DIR, or None when disabled."""
+    if not CACHE_DIR:
+        return None
+    with _caches_lock:
+        if CACHE_DIR not in _caches:
+            _caches[CACHE_DIR] = ResultCache(CACHE_DIR)
+        return _caches[CACHE_DIR]
+
+
+def cached(kind, compute, cache=None, store_dtype=None, min_seconds=None, **inputs):
+    """Return compute() -> {name: array}, served from the disk cache when possible.
+
+    Without a cache (none given and FUGACITOR_CACHE_DIR unset) this simply
+    calls compute(). Results that took less than `min_seconds` (default
+    MIN_COMPUTE_SECONDS) to compute are not stored. With `store_dtype`
+    (e.g. np.float32 for plot data) entries are stored at that precision
+    and fresh results are rounded the same way, so a hit and a miss return
+    identical values. A cache that cannot be written is skipped, never fatal.
+    """
+    cache = cache if cache is not None else default_cache()
+    if cache is None:
+        return compute()
+
+    key = fingerprint(kind, **inputs)
+    arrays = cache.get(key)
+    if arrays is None:
+        t0 = time.perf_counter()
+        arrays = compute()
+        elapsed = time.perf_counter() - t0
+        if store_dtype is not None:
+            arrays = {name: np.asarray(a, dtype=store_dtype) for name, a in arrays.items()}
+        if elapsed >= (MIN_COMPUTE_SECONDS if min_seconds is None else min_seconds):
+            try:
+                cache.put(key, arrays)
+            except OSError:
+                pass
+    if store_dtype is not None:
+        arrays = {name: a.astype(float) for name, a in arrays.items()}
+    return arrays
+
+
+# ------------------------------------------------------------
+# Command Line
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or trim the on-disk result cache.")
+    parser.add_argument("--dir", default=CACHE_DIR, help="cache directory (default: $FUGACITOR_CACHE_DIR)")
+    parser.add_argument("--clear", action="store_true", help="delete every entry")
+    parser.add_argument("--evict", action="store_true", help="trim to FUGACITOR_CACHE_MAX_MB")
+    args = parser.parse_args(argv)
+
+    if not args.dir:
+        parser.error("no cache directory; pass --dir or set FUGACITOR_CACHE_DIR")
+    cache = ResultCache(args.dir)
+    if args.clear:
+        cache.clear()
+    elif args.evict:
+        cache.evict()
+
+    found = cache.entries()
+    total = sum(size for _, size, _ in found)
+    print(f"{args.dir}: {len(found)} entries, {total / 1e6:.1f} MB (limit {cache.max_bytes / 1e6:.0f} MB)")
+    if found:
+        oldest = time.time() - min(mtime for mtime, _, _ in found)
+        print(f"least recently used entry: {oldest / 3600:.1f} h ago")
+
+
+if __name__ == "__main__":
+    main()
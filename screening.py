@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+import units
+from pitzer_engine import SPECIES, TC, PC, OMEGA, pitzer_fugacity
+
+# ------------------------------------------------------------
+# Whole-Database Screening
+# ------------------------------------------------------------
+RANK_BY = {
+    "deviation": "|1 − φ|",
+    "fugacity": "Fugacity",
+}
+
+
+def screen_species(T, P, k=10, by="deviation", tr_range=None, pr_range=None, f_unit="bar"):
+    """Rank every built-in species at (T, P) and return the top k.
+
+    All species are evaluated in one vectorized call. `by` is "deviation"
+    (largest |1 − φ| first) or "fugacity" (largest pure-gas f first).
+    `tr_range` / `pr_range` are optional (min, max) filters on Tr and Pr.
+    Fugacity is reported in `f_unit` (any absolute pressure unit).
+    Only the k winners are sorted, via np.argpartition.
+    """
+    f_conv = units.resolve(f_unit, "fugacity")
+    res = pitzer_fugacity(T, P, TC, PC, OMEGA)
+    score = np.abs(1.0 - res["phi"]) if by == "deviation" else res["fugacity"]
+
+    mask = np.ones(len(SPECIES), dtype=bool)
+    if tr_range is not None:
+        mask &= (res["Tr"] >= tr_range[0]) & (res["Tr"] <= tr_range[1])
+    if pr_range is not None:
+        mask &= (res["Pr"] >= pr_range[0]) & (res["Pr"] <= pr_range[1])
+    candidates = np.flatnonzero(mask)
+
+    k = min(k, len(candidates))
+    if k == 0:
+        top = candidates
+    else:
+        top = candidates[np.argpartition(-score[candidates], k - 1)[:k]]
+        top = top[np.argsort(-score[top])]
+
+    return pd.DataFrame({
+        "Gas": [SPECIES[i] for i in top],
+        "Tr": res["Tr"][top],
+        "Pr": res["Pr"][top],
+        "φ": res["phi"][top],
+        RANK_BY["deviation"]: np.abs(1.0 - res["phi"][top]),
+        f"{RANK_BY['fugacity']} ({f_unit})": units.from_internal(res["fugacity"][top], f_conv),
+    })
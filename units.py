@@ -0,0 +1,77 @@
+import numpy as np
+
+# ------------------------------------------------------------
+# Unit Tables (engine units are K and absolute bar)
+# ------------------------------------------------------------
+# Each unit maps to (scale, offset) with  internal = value * scale + offset.
+ATM_BAR = 1.01325
+PSI_BAR = 0.0689475729
+
+TEMPERATURE_UNITS = {
+    "K": (1.0, 0.0),
+    "°C": (1.0, 273.15),
+    "°F": (5.0 / 9.0, 459.67 * 5.0 / 9.0),
+    "°R": (5.0 / 9.0, 0.0),
+}
+
+PRESSURE_UNITS = {
+    "bar": (1.0, 0.0),
+    "kPa": (0.01, 0.0),
+    "MPa": (10.0, 0.0),
+    "Pa": (1e-5, 0.0),
+    "atm": (ATM_BAR, 0.0),
+    "psia": (PSI_BAR, 0.0),
+    "psig": (PSI_BAR, ATM_BAR),
+    "mmHg": (ATM_BAR / 760.0, 0.0),
+}
+
+# Plain-ASCII spellings found in historian exports
+ALIASES = {
+    "C": "°C", "degC": "°C",
+    "F": "°F", "degF": "°F",
+    "R": "°R", "degR": "°R",
+    "psi": "psia",
+    "torr": "mmHg",
+}
+
+UNITS = {**{u: ("temperature", c) for u, c in TEMPERATURE_UNITS.items()},
+         **{u: ("pressure", c) for u, c in PRESSURE_UNITS.items()}}
+
+# Fugacity is an absolute quantity, so gauge units (nonzero offset) are excluded
+FUGACITY_UNITS = tuple(u for u, (_, offset) in PRESSURE_UNITS.items() if not offset)
+
+
+# ------------------------------------------------------------
+# Conversion (resolved once per column, applied as one array op)
+# ------------------------------------------------------------
+def resolve(unit, kind):
+    """Return the (scale, offset) pair for `unit`, checking it is a `kind` unit.
+
+    `kind` is "temperature", "pressure" or "fugacity" (absolute pressure units only).
+    """
+    name = ALIASES.get(unit, unit)
+    if kind == "fugacity":
+        if name not in FUGACITY_UNITS:
+            raise ValueError(f"Unknown or gauge fugacity unit: {unit!r}")
+        return PRESSURE_UNITS[name]
+    if name not in UNITS or UNITS[name][0] != kind:
+        raise ValueError(f"Unknown {kind} unit: {unit!r}")
+    return UNITS[name][1]
+
+
+def to_internal(values, conv):
+    """Convert a column to engine units using a resolved (scale, offset)."""
+    scale, offset = conv
+    out = np.multiply(values, scale, dtype=float)
+    if offset:
+        out += offset
+    return out
+
+
+def from_internal(values, conv):
+    """Convert a column from engine units using a resolved (scale, offset)."""
+    scale, offset = conv
+    out = np.subtract(values, offset, dtype=float) if offset else np.array(values, dtype=float)
+    if scale != 1.0:
+        out /= scale
+    return out